@@ -1,11 +1,14 @@
 import re
 import csv
 import os
+import sys
+import json
+import argparse
 from datetime import datetime
 from collections import defaultdict
-from openpyxl import Workbook
-from openpyxl.worksheet.table import Table, TableStyleInfo
-from openpyxl.styles import Font, PatternFill, Border, Side
+
+# Heavy dependencies (openpyxl) are imported inside the functions that need
+# them so that startup and the parse/analyze/export commands stay fast.
 
 def convert_price_to_gold(price_str):
     """Convert price from copper to gold.silver.copper format"""
@@ -49,6 +52,110 @@ def format_price_copper_to_wow(copper_total):
     except:
         return "0g 0s 0c"
 
+# Item catalog persisted between runs (item key -> item_id, name, level, quality)
+ITEM_CATALOG_FILE = "ah_item_catalog.json"
+
+def make_item_key(item_id, link_fields):
+    """Build the key identifying an item variant from its link
+    
+    Random-suffix items ("of the Monkey", "of the Bear") share a base
+    item_id, so the suffix id from the link is part of the key.
+    """
+    fields = link_fields.split(':')
+    suffix_id = fields[5] if len(fields) > 5 else ''
+    if suffix_id in ('', '0'):
+        return sys.intern(str(item_id))
+    return sys.intern(f"{item_id}:{suffix_id}")
+
+def new_item_catalog():
+    """Create an empty item catalog shared by both factions"""
+    return {
+        'items': {},       # item key -> {'item_id', 'name', 'level', 'quality'}
+        'sellers': [],     # seller_id -> interned seller name (per run)
+        'seller_ids': {}   # seller name -> seller_id
+    }
+
+def load_item_catalog(file_path=ITEM_CATALOG_FILE):
+    """Load the item catalog saved by a previous run, or start a new one"""
+    catalog = new_item_catalog()
+    
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return catalog
+    except Exception as e:
+        print(f"Error reading item catalog: {e}")
+        return catalog
+    
+    for item_key, fields in data.get('items', {}).items():
+        try:
+            item_id, name, level, quality = fields
+        except (TypeError, ValueError):
+            continue
+        catalog['items'][sys.intern(item_key)] = {
+            'item_id': item_id,
+            'name': sys.intern(name),
+            'level': level,
+            'quality': quality
+        }
+    
+    print(f"Loaded item catalog with {len(catalog['items'])} items")
+    return catalog
+
+def save_item_catalog(catalog, file_path=ITEM_CATALOG_FILE):
+    """Save the item catalog so the next run can reuse it
+    
+    Seller ids only mean something for this run's auctions, so sellers
+    are not saved.
+    """
+    data = {
+        'items': {item_key: [item['item_id'], item['name'], item['level'], item['quality']]
+                  for item_key, item in catalog['items'].items()}
+    }
+    
+    try:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+    except Exception as e:
+        print(f"Error saving item catalog: {e}")
+
+def register_item(catalog, item_key, item_id, item_name, level, quality):
+    """Add or refresh an item in the catalog"""
+    item = catalog['items'].get(item_key)
+    if item is None or item['name'] != item_name:
+        catalog['items'][item_key] = {
+            'item_id': item_id,
+            'name': sys.intern(item_name),
+            'level': level,
+            'quality': quality
+        }
+    else:
+        item['level'] = level
+        item['quality'] = quality
+
+def intern_seller(catalog, seller_name):
+    """Return the integer id for a seller name, adding it if needed"""
+    seller_id = catalog['seller_ids'].get(seller_name)
+    if seller_id is None:
+        seller_id = len(catalog['sellers'])
+        seller_name = sys.intern(seller_name)
+        catalog['sellers'].append(seller_name)
+        catalog['seller_ids'][seller_name] = seller_id
+    return seller_id
+
+def catalog_item_name(catalog, item_key):
+    """Look up an item name by item key"""
+    item = catalog['items'].get(item_key)
+    return item['name'] if item else f"Item {item_key}"
+
+def catalog_seller_name(catalog, seller_id):
+    """Look up a seller name by id"""
+    try:
+        return catalog['sellers'][seller_id]
+    except (IndexError, TypeError):
+        return "Unknown"
+
 def parse_auc_stat_stddev(file_path):
     """Parse Auc-Stat-StdDev.lua file to get market price data"""
     print(f"Processing StdDev file: {file_path}")
@@ -116,41 +223,6 @@ def parse_auc_stat_simple_market_prices(file_path):
     print(f"Found Simple stat market price data for {len(market_prices)} items")
     return market_prices
 
-def parse_auc_stat_histogram(file_path):
-    """Parse Auc-Stat-Histogram.lua file to get times seen and market price data"""
-    print(f"Processing histogram file: {file_path}")
-    
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-    except Exception as e:
-        print(f"Error reading histogram file: {e}")
-        return {}, {}
-    
-    times_seen = {}
-    market_prices = {}
-    
-    # Look for item data in format: ["12640"] = "0@percentile!percentile!price!count!bins;histogram_data"
-    pattern = r'\["(\d+)"\]\s*=\s*"[^!]+!([^!]+)!(\d+)!(\d+)!'
-    
-    matches = re.finditer(pattern, content)
-    
-    for match in matches:
-        item_id = int(match.group(1))
-        market_price_copper = int(match.group(3))
-        count = int(match.group(4))
-        
-        # Convert market price from copper to gold
-        market_price_gold = convert_price_to_gold(market_price_copper)
-        
-        # Store the highest count found for each item (in case there are multiple entries)
-        if item_id not in times_seen or times_seen[item_id] < count:
-            times_seen[item_id] = count
-            market_prices[item_id] = market_price_gold
-    
-    print(f"Found histogram data for {len(times_seen)} items")
-    return times_seen, market_prices
-
 def parse_auc_stat_simple(file_path):
     """Parse Auc-Stat-Simple.lua file to get times seen data"""
     print(f"Processing stat file: {file_path}")
@@ -180,8 +252,13 @@ def parse_auc_stat_simple(file_path):
     print(f"Found times seen data for {len(times_seen)} items")
     return times_seen
 
-def parse_auctioneer_data(file_path):
-    """Parse Auctioneer scan data from Lua file"""
+def parse_auctioneer_data(file_path, catalog):
+    """Parse Auctioneer scan data from Lua file
+    
+    Item names, levels and qualities are stored in the shared catalog; the
+    returned auction rows only carry the interned item key, the base
+    item_id and an integer seller id.
+    """
     print(f"Processing: {file_path}")
     
     try:
@@ -210,14 +287,15 @@ def parse_auctioneer_data(file_path):
             
             # Parse individual item entries using fallback approach immediately
             # Look for item patterns in the data content
-            item_pattern = r'Hitem:(\\d+):[^|]*\\|h\\[(.+?)\\]'
+            item_pattern = r'Hitem:(\\d+):([^|]*)\\|h\\[(.+?)\\]'
             
             matches = re.finditer(item_pattern, data_content, re.DOTALL)
             
             for match in matches:
                 try:
                     item_id = int(match.group(1))
-                    item_name = match.group(2)
+                    item_key = make_item_key(item_id, match.group(2))
+                    item_name = match.group(3)
                     
                     # Find the surrounding context for this item
                     start_pos = max(0, match.start() - 50)
@@ -247,18 +325,18 @@ def parse_auctioneer_data(file_path):
                     buyout_gold = convert_price_to_gold(buyout_price)
                     bid_gold = convert_price_to_gold(bid_price)
                     
+                    register_item(catalog, item_key, item_id, item_name, level, quality)
+                    
                     items.append({
+                        'item_key': item_key,
                         'item_id': item_id,
-                        'item_name': item_name,
-                        'level': level,
-                        'quality': quality,
                         'count': count,
                         'buyout_price_copper': buyout_price,
                         'buyout_price_gold': buyout_gold,
                         'bid_price_copper': bid_price,
                         'bid_price_gold': bid_gold,
                         'time_left': time_left,
-                        'seller_name': seller_name,
+                        'seller_id': intern_seller(catalog, seller_name),
                         'scan_frequency': 1
                     })
                     
@@ -273,14 +351,15 @@ def parse_auctioneer_data(file_path):
         print("Trying fallback parsing approach...")
         
         # Look for any item-like patterns in the entire file
-        alt_pattern = r'\|Hitem:(\d+):[^|]*\|h\[([^\]]+)\]\|h\|r'
+        alt_pattern = r'\|Hitem:(\d+):([^|]*)\|h\[([^\]]+)\]\|h\|r'
         
         matches = re.finditer(alt_pattern, content, re.DOTALL)
         
         for match in matches:
             try:
                 item_id = int(match.group(1))
-                item_name = match.group(2)
+                item_key = make_item_key(item_id, match.group(2))
+                item_name = match.group(3)
                 
                 # Look for the data after this item link
                 item_start = match.start()
@@ -307,18 +386,18 @@ def parse_auctioneer_data(file_path):
                     buyout_gold = convert_price_to_gold(buyout_price)
                     bid_gold = convert_price_to_gold(bid_price)
                     
+                    register_item(catalog, item_key, item_id, item_name, level, quality)
+                    
                     items.append({
+                        'item_key': item_key,
                         'item_id': item_id,
-                        'item_name': item_name,
-                        'level': level,
-                        'quality': quality,
                         'count': count,
                         'buyout_price_copper': buyout_price,
                         'buyout_price_gold': buyout_gold,
                         'bid_price_copper': bid_price,
                         'bid_price_gold': bid_gold,
                         'time_left': time_left,
-                        'seller_name': "Unknown",
+                        'seller_id': intern_seller(catalog, "Unknown"),
                         'scan_frequency': scan_frequency
                     })
                     
@@ -330,30 +409,30 @@ def parse_auctioneer_data(file_path):
     print(f"Total items found: {len(items)}")
     return items
 
-def analyze_arbitrage(horde_items, alliance_items, horde_times_seen=None, alliance_times_seen=None, horde_market_prices=None, alliance_market_prices=None):
+def analyze_arbitrage(horde_items, alliance_items, catalog, horde_times_seen=None, alliance_times_seen=None, horde_market_prices=None, alliance_market_prices=None):
     """Analyze cross-faction arbitrage opportunities"""
     print("Analyzing arbitrage opportunities...")
     
-    # Group items by name
-    horde_by_name = defaultdict(list)
-    alliance_by_name = defaultdict(list)
+    # Group items by item key (base id plus random suffix)
+    horde_by_key = defaultdict(list)
+    alliance_by_key = defaultdict(list)
     
     for item in horde_items:
-        horde_by_name[item['item_name']].append(item)
+        horde_by_key[item['item_key']].append(item)
     
     for item in alliance_items:
-        alliance_by_name[item['item_name']].append(item)
+        alliance_by_key[item['item_key']].append(item)
     
     # Find items that exist on both factions
-    common_items = set(horde_by_name.keys()) & set(alliance_by_name.keys())
+    common_items = horde_by_key.keys() & alliance_by_key.keys()
     print(f"Found {len(common_items)} items on both factions")
     
     
     arbitrage_opportunities = []
     
-    for item_name in common_items:
-        horde_items_list = horde_by_name[item_name]
-        alliance_items_list = alliance_by_name[item_name]
+    for item_key in common_items:
+        horde_items_list = horde_by_key[item_key]
+        alliance_items_list = alliance_by_key[item_key]
         
         # Filter out bid-only auctions (no buyout price) first
         horde_buyout_items = [item for item in horde_items_list if item['buyout_price_gold'] > 0]
@@ -367,8 +446,8 @@ def analyze_arbitrage(horde_items, alliance_items, horde_times_seen=None, allian
         horde_avg_price = sum(item['buyout_price_gold'] for item in horde_buyout_items) / len(horde_buyout_items)
         alliance_avg_price = sum(item['buyout_price_gold'] for item in alliance_buyout_items) / len(alliance_buyout_items)
         
-        # Get market prices from histogram data (prefer this over average)
-        item_id = horde_items_list[0]['item_id'] if horde_items_list else alliance_items_list[0]['item_id']
+        # Get market prices from stat data (prefer this over average)
+        item_id = horde_items_list[0]['item_id']
         horde_market_price = horde_market_prices.get(item_id, horde_avg_price) if horde_market_prices else horde_avg_price
         alliance_market_price = alliance_market_prices.get(item_id, alliance_avg_price) if alliance_market_prices else alliance_avg_price
             
@@ -394,12 +473,14 @@ def analyze_arbitrage(horde_items, alliance_items, horde_times_seen=None, allian
         else:
             cheaper_buyout = "Alliance"
         
-        # Get times seen from histogram files
+        # Get times seen from Simple stat files
         horde_total_scans = horde_times_seen.get(item_id, 0) if horde_times_seen else 0
         alliance_total_scans = alliance_times_seen.get(item_id, 0) if alliance_times_seen else 0
         
         arbitrage_opportunities.append({
-            'item_name': item_name,
+            'item_key': item_key,
+            'item_id': item_id,
+            'item_name': catalog_item_name(catalog, item_key),
             'horde_market_price': horde_market_price,
             'alliance_market_price': alliance_market_price,
             'horde_buyout_price': horde_min_price,
@@ -416,8 +497,12 @@ def analyze_arbitrage(horde_items, alliance_items, horde_times_seen=None, allian
     
     return arbitrage_opportunities
 
-def generate_excel_report(horde_items, alliance_items, arbitrage_opportunities):
+def generate_excel_report(horde_items, alliance_items, arbitrage_opportunities, catalog, output_dir="."):
     """Generate Excel reports with formatted tables"""
+    from openpyxl import Workbook
+    from openpyxl.worksheet.table import Table, TableStyleInfo
+    from openpyxl.styles import Font, PatternFill, Border, Side
+    
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
     # Create workbook with multiple sheets
@@ -523,30 +608,30 @@ def generate_excel_report(horde_items, alliance_items, arbitrage_opportunities):
     for col, header in enumerate(horde_headers, 1):
         ws_horde.cell(row=1, column=col, value=header)
     
-    # Group Horde items by name and find lowest prices
-    horde_by_name = defaultdict(list)
+    # Group Horde items by id and find lowest prices
+    horde_by_key = defaultdict(list)
     for item in horde_items:
-        horde_by_name[item['item_name']].append(item)
+        horde_by_key[item['item_key']].append(item)
     
     horde_bargains = []
-    for name, items in horde_by_name.items():
+    for item_key, items in horde_by_key.items():
         # Filter to only buyout auctions
         buyout_items = [item for item in items if item['buyout_price_gold'] > 0]
         if buyout_items:  # Only add if there are buyout auctions
             min_price_item = min(buyout_items, key=lambda x: x['buyout_price_gold'])
             horde_bargains.append({
-                'name': name,
+                'item_key': item_key,
                 'price': min_price_item['buyout_price_gold'],
                 'count': min_price_item['count'],
-                'seller': min_price_item['seller_name']
+                'seller_id': min_price_item['seller_id']
             })
     
     horde_bargains.sort(key=lambda x: x['price'])
     for row, item in enumerate(horde_bargains[:100], 2):
-        ws_horde.cell(row=row, column=1, value=item['name'])
+        ws_horde.cell(row=row, column=1, value=catalog_item_name(catalog, item['item_key']))
         ws_horde.cell(row=row, column=2, value=format_price_wow(item['price']))
         ws_horde.cell(row=row, column=3, value=item['count'])
-        ws_horde.cell(row=row, column=4, value=item['seller'])
+        ws_horde.cell(row=row, column=4, value=catalog_seller_name(catalog, item['seller_id']))
     
     # Convert Horde sheet to table
     if len(horde_bargains) > 0:
@@ -577,30 +662,30 @@ def generate_excel_report(horde_items, alliance_items, arbitrage_opportunities):
     for col, header in enumerate(alliance_headers, 1):
         ws_alliance.cell(row=1, column=col, value=header)
     
-    # Group Alliance items by name and find lowest prices
-    alliance_by_name = defaultdict(list)
+    # Group Alliance items by id and find lowest prices
+    alliance_by_key = defaultdict(list)
     for item in alliance_items:
-        alliance_by_name[item['item_name']].append(item)
+        alliance_by_key[item['item_key']].append(item)
     
     alliance_bargains = []
-    for name, items in alliance_by_name.items():
+    for item_key, items in alliance_by_key.items():
         # Filter to only buyout auctions
         buyout_items = [item for item in items if item['buyout_price_gold'] > 0]
         if buyout_items:  # Only add if there are buyout auctions
             min_price_item = min(buyout_items, key=lambda x: x['buyout_price_gold'])
             alliance_bargains.append({
-                'name': name,
+                'item_key': item_key,
                 'price': min_price_item['buyout_price_gold'],
                 'count': min_price_item['count'],
-                'seller': min_price_item['seller_name']
+                'seller_id': min_price_item['seller_id']
             })
     
     alliance_bargains.sort(key=lambda x: x['price'])
     for row, item in enumerate(alliance_bargains[:100], 2):
-        ws_alliance.cell(row=row, column=1, value=item['name'])
+        ws_alliance.cell(row=row, column=1, value=catalog_item_name(catalog, item['item_key']))
         ws_alliance.cell(row=row, column=2, value=format_price_wow(item['price']))
         ws_alliance.cell(row=row, column=3, value=item['count'])
-        ws_alliance.cell(row=row, column=4, value=item['seller'])
+        ws_alliance.cell(row=row, column=4, value=catalog_seller_name(catalog, item['seller_id']))
     
     # Convert Alliance sheet to table
     if len(alliance_bargains) > 0:
@@ -625,7 +710,7 @@ def generate_excel_report(horde_items, alliance_items, arbitrage_opportunities):
         ws_alliance.column_dimensions[column].width = adjusted_width
     
     # Save Excel file
-    excel_filename = f"ah_analysis_{timestamp}.xlsx"
+    excel_filename = os.path.join(output_dir, f"ah_analysis_{timestamp}.xlsx")
     wb.save(excel_filename)
     
     print(f"Generated Excel report: {excel_filename}")
@@ -635,27 +720,419 @@ def generate_excel_report(horde_items, alliance_items, arbitrage_opportunities):
     
     return excel_filename
 
-def main():
-    """Main function"""
-    print("WoW Classic AH Analyzer - Final Version")
-    print("=" * 50)
+# Default WoW Classic Era WTF folder (override with a WTF root argument)
+DEFAULT_WTF_ROOT = r"C:\Program Files (x86)\World of Warcraft\_classic_era_\WTF"
+
+# Cache of the last SavedVariables discovery, keyed on directory mtimes
+DISCOVERY_CACHE_FILE = "ah_discovery_cache.json"
+
+# Only the start of each file is read when identifying it
+HEADER_SNIFF_BYTES = 64 * 1024
+
+# SavedVariables global name fragment -> role in the analysis
+SAVED_VARIABLE_ROLES = [
+    ('ScanData', 'scandata'),
+    ('StatSimple', 'simple')
+]
+
+def sniff_saved_variables_header(file_path):
+    """Identify an Auctioneer SavedVariables file from its header
     
-    # File paths
-    horde_path = r"C:\Program Files (x86)\World of Warcraft\_classic_era_\WTF\Account\LUCIA1\SavedVariables\auc-scandata.lua"
-    alliance_path = r"C:\Program Files (x86)\World of Warcraft\_classic_era_\WTF\Account\51718250#1\SavedVariables\auc-scandata.lua"
+    Returns (role, realm, faction) or None if the file isn't one we use.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            header = f.read(HEADER_SNIFF_BYTES)
+    except Exception as e:
+        print(f"Error reading {file_path}: {e}")
+        return None
+    
+    # SavedVariables files start with the addon's global: AucScanData = {
+    global_match = re.search(r'^\s*(\w+)\s*=', header)
+    if not global_match:
+        return None
+    
+    role = None
+    for fragment, candidate in SAVED_VARIABLE_ROLES:
+        if fragment.lower() in global_match.group(1).lower():
+            role = candidate
+            break
+    if role is None:
+        return None
+    
+    realm = None
+    faction = None
+    
+    # Scan data nests factions under realms: ["Realm"] = { ["Horde"] = {
+    nested_match = re.search(r'\["([^"]+)"\]\s*=\s*\{\s*\["(Horde|Alliance|Neutral)"\]', header)
+    # Stat files use combined server keys: ["Realm-Horde"] = {
+    key_match = re.search(r'\["([^"]+)-(Horde|Alliance|Neutral)"\]', header)
+    
+    if nested_match:
+        realm, faction = nested_match.group(1), nested_match.group(2)
+    elif key_match:
+        realm, faction = key_match.group(1), key_match.group(2)
+    
+    return role, realm, faction
+
+def _scan_account(account_name, saved_variables_dir):
+    """Sniff every Lua file in one account's SavedVariables folder"""
+    account = {
+        'account': account_name,
+        'path': saved_variables_dir,
+        'realm': None,
+        'faction': None
+    }
+    
+    try:
+        entries = [entry for entry in os.scandir(saved_variables_dir)
+                   if entry.is_file() and entry.name.lower().endswith('.lua')]
+    except OSError as e:
+        print(f"Error scanning {saved_variables_dir}: {e}")
+        return account
+    
+    for entry in entries:
+        sniffed = sniff_saved_variables_header(entry.path)
+        if sniffed is None:
+            continue
+        
+        role, realm, faction = sniffed
+        account[role] = entry.path
+        
+        # The scan data decides the account's realm and faction
+        if role == 'scandata' or account['faction'] is None:
+            account['realm'] = realm or account['realm']
+            account['faction'] = faction or account['faction']
+    
+    return account
+
+def _saved_variables_dirs(wtf_root):
+    """List (account name, SavedVariables dir) pairs under a WTF root
+    
+    Also returns the mtimes of the Account folder, every account folder
+    (even those without SavedVariables yet) and every SavedVariables
+    folder. They are taken before the folders are read, so a change made
+    during the scan invalidates the cache on the next run.
+    """
+    account_root = os.path.join(wtf_root, 'Account')
+    saved_variables_dirs = []
+    mtimes = {account_root: os.stat(account_root).st_mtime_ns}
+    
+    with os.scandir(account_root) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            mtimes[entry.path] = entry.stat().st_mtime_ns
+            saved_variables_dir = os.path.join(entry.path, 'SavedVariables')
+            try:
+                mtimes[saved_variables_dir] = os.stat(saved_variables_dir).st_mtime_ns
+            except OSError:
+                continue
+            if os.path.isdir(saved_variables_dir):
+                saved_variables_dirs.append((entry.name, saved_variables_dir))
+    
+    saved_variables_dirs.sort()
+    return saved_variables_dirs, mtimes
+
+def _load_discovery_cache(wtf_root, cache_path):
+    """Return cached accounts if no watched directory has changed"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Error reading discovery cache: {e}")
+        return None
+    
+    if cache.get('wtf_root') != wtf_root:
+        return None
+    
+    try:
+        for path, mtime in cache['mtimes'].items():
+            if os.stat(path).st_mtime_ns != mtime:
+                return None
+    except (OSError, KeyError):
+        return None
+    
+    return cache.get('accounts')
+
+def discover_saved_variables(wtf_root=DEFAULT_WTF_ROOT, cache_path=DISCOVERY_CACHE_FILE):
+    """Find Auctioneer SavedVariables files for every account under a WTF root
+    
+    Returns a list of account dicts with 'account', 'path', 'realm',
+    'faction' and a file path for each role found ('scandata', 'simple').
+    """
+    wtf_root = os.path.abspath(wtf_root)
+    
+    if cache_path:
+        cached_accounts = _load_discovery_cache(wtf_root, cache_path)
+        if cached_accounts is not None:
+            print(f"Using cached discovery for {len(cached_accounts)} accounts")
+            return cached_accounts
+    
+    print(f"Searching for SavedVariables under: {wtf_root}")
+    
+    try:
+        saved_variables_dirs, mtimes = _saved_variables_dirs(wtf_root)
+    except OSError as e:
+        print(f"Error scanning WTF folder: {e}")
+        return []
+    
+    from concurrent.futures import ThreadPoolExecutor
     
-    # Histogram file paths (contains times seen)
-    horde_histogram_path = r"C:\Program Files (x86)\World of Warcraft\_classic_era_\WTF\Account\LUCIA1\SavedVariables\Auc-Stat-Histogram.lua"
-    alliance_histogram_path = r"C:\Program Files (x86)\World of Warcraft\_classic_era_\WTF\Account\51718250#1\SavedVariables\Auc-Stat-Histogram.lua"
+    # Header sniffing is I/O bound, so accounts are scanned in parallel
+    with ThreadPoolExecutor(max_workers=min(8, len(saved_variables_dirs) or 1)) as executor:
+        accounts = list(executor.map(lambda pair: _scan_account(*pair), saved_variables_dirs))
     
-    # Simple stat file paths (contains market prices)
-    horde_simple_path = r"C:\Program Files (x86)\World of Warcraft\_classic_era_\WTF\Account\LUCIA1\SavedVariables\Auc-Stat-Simple.lua"
-    alliance_simple_path = r"C:\Program Files (x86)\World of Warcraft\_classic_era_\WTF\Account\51718250#1\SavedVariables\Auc-Stat-Simple.lua"
+    accounts = [account for account in accounts if 'scandata' in account]
+    print(f"Found Auctioneer scan data for {len(accounts)} accounts")
     
+    if cache_path:
+        try:
+            cache = {
+                'wtf_root': wtf_root,
+                'mtimes': mtimes,
+                'accounts': accounts
+            }
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=1)
+        except Exception as e:
+            print(f"Error saving discovery cache: {e}")
+    
+    return accounts
+
+def find_faction_accounts(accounts, horde_name=None, alliance_name=None, realm=None):
+    """Pick a Horde and an Alliance account whose scan data is on the same realm
+    
+    Accounts named explicitly must exist and have scan data for the
+    expected faction. Returns (horde_account, alliance_account), or
+    (None, None) after printing the reason no pair could be found.
+    """
+    accounts_by_name = {account['account']: account for account in accounts}
+    candidates = {}
+    
+    for faction, account_name in (('Horde', horde_name), ('Alliance', alliance_name)):
+        if account_name:
+            account = accounts_by_name.get(account_name)
+            if account is None:
+                print(f"ERROR: No Auctioneer scan data found for account {account_name}")
+                return None, None
+            if account.get('faction') != faction:
+                print(f"ERROR: Account {account_name} has {account.get('faction')} scan data, not {faction}")
+                return None, None
+            candidates[faction] = [account]
+        else:
+            candidates[faction] = [account for account in accounts if account.get('faction') == faction]
+        
+        if realm:
+            candidates[faction] = [account for account in candidates[faction] if account.get('realm') == realm]
+        
+        if not candidates[faction]:
+            realm_text = f" on realm {realm}" if realm else ""
+            print(f"ERROR: No {faction} Auctioneer scan data found{realm_text}")
+            return None, None
+    
+    # Cross-faction prices only compare within a realm
+    for horde_account in candidates['Horde']:
+        for alliance_account in candidates['Alliance']:
+            if horde_account.get('realm') == alliance_account.get('realm'):
+                return horde_account, alliance_account
+    
+    horde_realms = sorted({str(account.get('realm')) for account in candidates['Horde']})
+    alliance_realms = sorted({str(account.get('realm')) for account in candidates['Alliance']})
+    print("ERROR: No Horde and Alliance scan data on the same realm")
+    print(f"Horde realms: {', '.join(horde_realms)}")
+    print(f"Alliance realms: {', '.join(alliance_realms)}")
+    return None, None
+
+# Opportunity snapshot from the previous run, used for delta reports
+SNAPSHOT_FILE = "ah_snapshot.json"
+
+# Relative buyout price change that counts as a material move (10%)
+DEFAULT_CHANGE_THRESHOLD = 0.10
+
+def _gold_to_copper(price_gold):
+    """Convert decimal gold to whole copper for compact storage"""
+    return int(round(price_gold * 10000))
+
+def snapshot_key(realm, horde_account, alliance_account):
+    """Identify the realm and account pair a snapshot belongs to"""
+    return f"{realm}|{horde_account}|{alliance_account}"
+
+def _read_snapshots(file_path):
+    """Read every stored snapshot, keyed by snapshot_key"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Error reading snapshot: {e}")
+        return {}
+    
+    return data.get('snapshots', {})
+
+def load_snapshot(key, file_path=SNAPSHOT_FILE):
+    """Load the previous run's opportunity snapshot for a realm and account pair
+    
+    Returns a dict of item key -> [horde buyout, alliance buyout] in copper,
+    or None if there is no previous snapshot for that pair.
+    """
+    snapshot = _read_snapshots(file_path).get(key)
+    return snapshot['opportunities'] if snapshot else None
+
+def save_snapshot(arbitrage_opportunities, key, file_path=SNAPSHOT_FILE):
+    """Save this run's opportunity set keyed by item key
+    
+    Snapshots for other realms and account pairs in the file are kept.
+    """
+    snapshots = _read_snapshots(file_path)
+    snapshots[key] = {
+        'timestamp': datetime.now().strftime("%Y%m%d_%H%M%S"),
+        'opportunities': {
+            opp['item_key']: [_gold_to_copper(opp['horde_buyout_price']),
+                              _gold_to_copper(opp['alliance_buyout_price'])]
+            for opp in arbitrage_opportunities
+        }
+    }
+    
+    try:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump({'snapshots': snapshots}, f, separators=(',', ':'))
+    except Exception as e:
+        print(f"Error saving snapshot: {e}")
+
+def _price_moved(previous_copper, current_copper, threshold):
+    """Check whether a buyout price changed by more than the threshold"""
+    if previous_copper == 0:
+        return current_copper != 0
+    return abs(current_copper - previous_copper) / previous_copper > threshold
+
+def diff_opportunities(previous, arbitrage_opportunities, catalog, threshold=DEFAULT_CHANGE_THRESHOLD):
+    """Compare this run's opportunities against the previous snapshot
+    
+    Returns only new, vanished and materially moved opportunities, with
+    buyout prices in decimal gold.
+    """
+    deltas = []
+    seen = set()
+    
+    for opp in arbitrage_opportunities:
+        item_key = opp['item_key']
+        seen.add(item_key)
+        horde_copper = _gold_to_copper(opp['horde_buyout_price'])
+        alliance_copper = _gold_to_copper(opp['alliance_buyout_price'])
+        
+        previous_prices = previous.get(item_key)
+        if previous_prices is None:
+            change = 'new'
+            previous_horde, previous_alliance = 0, 0
+        else:
+            previous_horde, previous_alliance = previous_prices
+            if not (_price_moved(previous_horde, horde_copper, threshold) or
+                    _price_moved(previous_alliance, alliance_copper, threshold)):
+                continue
+            change = 'moved'
+        
+        deltas.append({
+            'item_key': item_key,
+            'item_name': opp['item_name'],
+            'change': change,
+            'horde_buyout_price': opp['horde_buyout_price'],
+            'alliance_buyout_price': opp['alliance_buyout_price'],
+            'previous_horde_buyout_price': convert_price_to_gold(previous_horde),
+            'previous_alliance_buyout_price': convert_price_to_gold(previous_alliance)
+        })
+    
+    for item_key, (previous_horde, previous_alliance) in previous.items():
+        if item_key in seen:
+            continue
+        deltas.append({
+            'item_key': item_key,
+            'item_name': catalog_item_name(catalog, item_key),
+            'change': 'vanished',
+            'horde_buyout_price': 0,
+            'alliance_buyout_price': 0,
+            'previous_horde_buyout_price': convert_price_to_gold(previous_horde),
+            'previous_alliance_buyout_price': convert_price_to_gold(previous_alliance)
+        })
+    
+    return deltas
+
+def export_opportunities_csv(arbitrage_opportunities, file_path):
+    """Export arbitrage opportunities to CSV with prices in decimal gold"""
+    fieldnames = [
+        'item_key', 'item_id', 'item_name', 'horde_scan_count', 'alliance_scan_count',
+        'horde_buyout_price', 'alliance_buyout_price', 'price_difference',
+        'horde_market_price', 'alliance_market_price', 'cheaper_buyout', 'cheaper_historic'
+    ]
+    
+    with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(arbitrage_opportunities)
+    
+    print(f"Exported {len(arbitrage_opportunities)} opportunities to {file_path}")
+    return file_path
+
+def export_deltas_csv(deltas, file_path):
+    """Export opportunity changes since the previous run to CSV"""
+    fieldnames = [
+        'item_key', 'item_name', 'change', 'horde_buyout_price', 'alliance_buyout_price',
+        'previous_horde_buyout_price', 'previous_alliance_buyout_price'
+    ]
+    
+    with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(deltas)
+    
+    print(f"Exported {len(deltas)} changes to {file_path}")
+    return file_path
+
+def open_report(file_path):
+    """Open a generated report with the platform's default application"""
+    import subprocess
+    
+    try:
+        if hasattr(os, 'startfile'):
+            os.startfile(file_path)
+        elif sys.platform == 'darwin':
+            subprocess.Popen(['open', file_path])
+        else:
+            subprocess.Popen(['xdg-open', file_path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        print("Opened Excel report")
+    except Exception:
+        print(f"Please open {file_path} manually")
+
+def load_faction_data(args):
+    """Discover and parse the Horde and Alliance SavedVariables
+    
+    Returns a dict with the shared catalog, both factions' auctions, times
+    seen and market prices, or None if the data couldn't be found.
+    """
+    # Find the Horde and Alliance SavedVariables under the WTF folder
+    accounts = discover_saved_variables(args.wtf_root, args.discovery_cache)
+    horde_account, alliance_account = find_faction_accounts(
+        accounts, args.horde_account, args.alliance_account, args.realm)
+    
+    if horde_account is None or alliance_account is None:
+        print(f"Searched SavedVariables under: {args.wtf_root}")
+        return None
+    
+    # File paths
+    horde_path = horde_account['scandata']
+    alliance_path = alliance_account['scandata']
+    
+    # Simple stat file paths (contains market prices and times seen)
+    horde_simple_path = horde_account.get('simple', '')
+    alliance_simple_path = alliance_account.get('simple', '')
+    
+    print(f"Horde account: {horde_account['account']} ({horde_account['realm']})")
+    print(f"Alliance account: {alliance_account['account']} ({alliance_account['realm']})")
     print(f"Horde data path: {horde_path}")
     print(f"Alliance data path: {alliance_path}")
-    print(f"Horde histogram path: {horde_histogram_path}")
-    print(f"Alliance histogram path: {alliance_histogram_path}")
     print(f"Horde Simple stat path: {horde_simple_path}")
     print(f"Alliance Simple stat path: {alliance_simple_path}")
     print()
@@ -663,60 +1140,67 @@ def main():
     # Check if files exist
     if not os.path.exists(horde_path):
         print(f"ERROR: Horde scan data not found at {horde_path}")
-        return
+        return None
     
     if not os.path.exists(alliance_path):
         print(f"ERROR: Alliance scan data not found at {alliance_path}")
-        return
-    
-    # Extract times seen data and market prices from histogram files
-    print("Extracting Horde histogram data...")
-    horde_times_seen, horde_histogram_market_prices = parse_auc_stat_histogram(horde_histogram_path)
+        return None
     
-    print("Extracting Alliance histogram data...")
-    alliance_times_seen, alliance_histogram_market_prices = parse_auc_stat_histogram(alliance_histogram_path)
-    
-    # Extract market price data from Simple stat files (better than histogram prices)
+    # Extract market price data from Simple stat files
     print("Extracting Horde market price data...")
     horde_market_prices = parse_auc_stat_simple_market_prices(horde_simple_path)
     
     print("Extracting Alliance market price data...")
     alliance_market_prices = parse_auc_stat_simple_market_prices(alliance_simple_path)
     
-    # Also get times seen from Simple stat (more accurate than histogram)
+    # Extract times seen from Simple stat files
     print("Extracting Horde times seen from Simple stat...")
-    horde_simple_times_seen = parse_auc_stat_simple(horde_simple_path)
+    horde_times_seen = parse_auc_stat_simple(horde_simple_path)
     
     print("Extracting Alliance times seen from Simple stat...")
-    alliance_simple_times_seen = parse_auc_stat_simple(alliance_simple_path)
+    alliance_times_seen = parse_auc_stat_simple(alliance_simple_path)
     
-    # Use Simple stat times seen (they're more accurate)
-    horde_times_seen = horde_simple_times_seen
-    alliance_times_seen = alliance_simple_times_seen
+    # Load the item catalog shared by both factions
+    catalog = load_item_catalog(args.catalog)
     
     # Extract auction data
     print("Extracting Horde auction data...")
-    horde_items = parse_auctioneer_data(horde_path)
+    horde_items = parse_auctioneer_data(horde_path, catalog)
     
     print("Extracting Alliance auction data...")
-    alliance_items = parse_auctioneer_data(alliance_path)
+    alliance_items = parse_auctioneer_data(alliance_path, catalog)
+    
+    save_item_catalog(catalog, args.catalog)
     
     if not horde_items and not alliance_items:
         print("No auction data found in either file!")
         print("This might indicate the data format is different than expected.")
         print("Please check that the files contain Auctioneer scan data.")
-        return
+        return None
     
     print(f"\nTotal items found:")
     print(f"Horde: {len(horde_items)}")
     print(f"Alliance: {len(alliance_items)}")
     
-    if len(horde_items) == 0 and len(alliance_items) == 0:
-        print("No items found. The data format may be different than expected.")
-        return
-    
-    # Analyze arbitrage opportunities
-    arbitrage_opportunities = analyze_arbitrage(horde_items, alliance_items, horde_times_seen, alliance_times_seen, horde_market_prices, alliance_market_prices)
+    return {
+        'realm': horde_account['realm'],
+        'horde_account': horde_account['account'],
+        'alliance_account': alliance_account['account'],
+        'catalog': catalog,
+        'horde_items': horde_items,
+        'alliance_items': alliance_items,
+        'horde_times_seen': horde_times_seen,
+        'alliance_times_seen': alliance_times_seen,
+        'horde_market_prices': horde_market_prices,
+        'alliance_market_prices': alliance_market_prices
+    }
+
+def run_analysis(data):
+    """Run the arbitrage analysis on parsed faction data"""
+    arbitrage_opportunities = analyze_arbitrage(
+        data['horde_items'], data['alliance_items'], data['catalog'],
+        data['horde_times_seen'], data['alliance_times_seen'],
+        data['horde_market_prices'], data['alliance_market_prices'])
     
     if len(arbitrage_opportunities) == 0:
         print("No arbitrage opportunities found.")
@@ -725,19 +1209,174 @@ def main():
         print("- Price differences are too small")
         print("- Data parsing needs adjustment")
     
+    return arbitrage_opportunities
+
+def command_parse(args):
+    """Parse SavedVariables and refresh the item catalog"""
+    data = load_faction_data(args)
+    if data is None:
+        return 1
+    
+    print(f"\nItem catalog: {len(data['catalog']['items'])} items saved to {args.catalog}")
+    return 0
+
+def command_analyze(args):
+    """Parse and analyze, printing the top opportunities"""
+    data = load_faction_data(args)
+    if data is None:
+        return 1
+    
+    arbitrage_opportunities = run_analysis(data)
+    
+    print(f"\nTop {min(args.top, len(arbitrage_opportunities))} of {len(arbitrage_opportunities)} opportunities:")
+    for opp in arbitrage_opportunities[:args.top]:
+        print(f"  {opp['item_name']}: Horde {format_price_wow(opp['horde_buyout_price'])}, "
+              f"Alliance {format_price_wow(opp['alliance_buyout_price'])}, "
+              f"difference {format_price_wow(opp['price_difference'])}")
+    return 0
+
+def command_report(args):
+    """Parse, analyze and write the Excel report"""
+    import importlib.util
+    
+    # Check before parsing so a missing dependency fails straight away
+    if importlib.util.find_spec("openpyxl") is None:
+        print("ERROR: The report command needs openpyxl for Excel output")
+        print("Install it with: pip install openpyxl")
+        print("(parse, analyze, export and delta work without it)")
+        return 1
+    
+    data = load_faction_data(args)
+    if data is None:
+        return 1
+    
+    arbitrage_opportunities = run_analysis(data)
+    
     # Generate reports
-    excel_file = generate_excel_report(horde_items, alliance_items, arbitrage_opportunities)
+    excel_file = generate_excel_report(data['horde_items'], data['alliance_items'],
+                                       arbitrage_opportunities, data['catalog'], args.output_dir)
     
     print(f"\nAnalysis complete!")
     print(f"Excel report: {excel_file}")
     
-    # Open the Excel file
-    try:
-        os.startfile(excel_file)
-        print("Opened Excel report")
-    except:
-        print(f"Please open {excel_file} manually")
+    if not args.no_open:
+        open_report(excel_file)
+    return 0
 
-if __name__ == "__main__":
-    main()
+def command_export(args):
+    """Parse, analyze and export opportunities to CSV"""
+    data = load_faction_data(args)
+    if data is None:
+        return 1
+    
+    arbitrage_opportunities = run_analysis(data)
+    
+    output = args.output or f"ah_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    export_opportunities_csv(arbitrage_opportunities, output)
+    return 0
+
+def command_delta(args):
+    """Parse, analyze and export only the changes since the previous delta run
+    
+    This is the only command that moves the snapshot forward, so changes
+    are never lost to an analyze/report/export run in between.
+    """
+    data = load_faction_data(args)
+    if data is None:
+        return 1
+    
+    arbitrage_opportunities = run_analysis(data)
+    
+    # Only compare against a snapshot from the same realm and accounts
+    key = snapshot_key(data['realm'], data['horde_account'], data['alliance_account'])
+    previous = load_snapshot(key, args.snapshot)
+    save_snapshot(arbitrage_opportunities, key, args.snapshot)
+    
+    if previous is None:
+        print(f"No previous snapshot for {data['realm']} ({data['horde_account']}/{data['alliance_account']}), "
+              f"saved this run as the baseline in {args.snapshot}")
+        return 0
+    
+    deltas = diff_opportunities(previous, arbitrage_opportunities, data['catalog'], args.change_threshold)
+    changes = defaultdict(int)
+    for delta in deltas:
+        changes[delta['change']] += 1
+    print(f"Changes since last run: {changes['new']} new, {changes['vanished']} vanished, "
+          f"{changes['moved']} moved more than {args.change_threshold:.0%}")
+    
+    for delta in deltas:
+        print(f"  [{delta['change']}] {delta['item_name']}: "
+              f"Horde {format_price_wow(delta['previous_horde_buyout_price'])} -> {format_price_wow(delta['horde_buyout_price'])}, "
+              f"Alliance {format_price_wow(delta['previous_alliance_buyout_price'])} -> {format_price_wow(delta['alliance_buyout_price'])}")
+    
+    output = args.output or f"ah_delta_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    export_deltas_csv(deltas, output)
+    return 0
 
+def build_parser():
+    """Build the command line parser"""
+    parser = argparse.ArgumentParser(
+        prog="ah_analyzer_final.py",
+        description="WoW Classic cross-faction auction house analyzer")
+    
+    # Options shared by every subcommand
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--wtf-root", default=DEFAULT_WTF_ROOT,
+                        help="WoW WTF folder containing Account/*/SavedVariables")
+    common.add_argument("--realm", help="realm to analyze (default: first realm with both factions)")
+    common.add_argument("--horde-account", help="account folder to use for Horde (default: discovered)")
+    common.add_argument("--alliance-account", help="account folder to use for Alliance (default: discovered)")
+    common.add_argument("--catalog", default=ITEM_CATALOG_FILE, help="item catalog file")
+    common.add_argument("--discovery-cache", default=DISCOVERY_CACHE_FILE,
+                        help="SavedVariables discovery cache file ('' to disable)")
+    
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    
+    parse_parser = subparsers.add_parser("parse", parents=[common],
+                                         help="parse SavedVariables and refresh the item catalog")
+    parse_parser.set_defaults(func=command_parse)
+    
+    analyze_parser = subparsers.add_parser("analyze", parents=[common],
+                                           help="print the top arbitrage opportunities")
+    analyze_parser.add_argument("--top", type=int, default=20, help="number of opportunities to print")
+    analyze_parser.set_defaults(func=command_analyze)
+    
+    report_parser = subparsers.add_parser("report", parents=[common],
+                                          help="write the Excel report (default)")
+    report_parser.add_argument("--output-dir", default=".", help="folder for the Excel report")
+    report_parser.add_argument("--no-open", action="store_true", help="don't open the report when done")
+    report_parser.set_defaults(func=command_report)
+    
+    export_parser = subparsers.add_parser("export", parents=[common],
+                                          help="export opportunities to CSV")
+    export_parser.add_argument("-o", "--output", help="CSV file (default: ah_analysis_<timestamp>.csv)")
+    export_parser.set_defaults(func=command_export)
+    
+    delta_parser = subparsers.add_parser("delta", parents=[common],
+                                         help="export only opportunities changed since the last run")
+    delta_parser.add_argument("-o", "--output", help="CSV file (default: ah_delta_<timestamp>.csv)")
+    delta_parser.add_argument("--snapshot", default=SNAPSHOT_FILE,
+                              help="opportunity snapshot compared between delta runs")
+    delta_parser.add_argument("--change-threshold", type=float, default=DEFAULT_CHANGE_THRESHOLD,
+                              help="relative buyout change reported as moved (default: 0.10)")
+    delta_parser.set_defaults(func=command_delta)
+    
+    return parser
+
+def main(argv=None):
+    """Main function"""
+    argv = sys.argv[1:] if argv is None else argv
+    
+    # Double-clicking the executable runs the full report
+    if not argv:
+        argv = ["report"]
+    
+    args = build_parser().parse_args(argv)
+    
+    print("WoW Classic AH Analyzer - Final Version")
+    print("=" * 50)
+    
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Startup time and lazy import checks for the command line"""
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, "ah_analyzer_final.py")
+
+sys.path.insert(0, ROOT)
+import ah_analyzer_final  # noqa: E402
+
+# Wall-clock budget for a CLI start, including interpreter startup
+STARTUP_BUDGET_SECONDS = 1.0
+
+# Modules only the commands that need them may load
+HEAVY_MODULES = ["openpyxl", "numpy"]
+
+
+def run_python(args):
+    """Run a fresh interpreter in the repo root and return the result"""
+    return subprocess.run([sys.executable] + args, cwd=ROOT,
+                          capture_output=True, text=True, timeout=30)
+
+
+def best_startup_time(args, runs=3):
+    """Fastest of several runs, to keep the budget check stable"""
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = run_python(args)
+        elapsed = time.perf_counter() - start
+        assert result.returncode == 0, result.stderr
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def test_import_does_not_load_heavy_modules():
+    code = ("import sys, ah_analyzer_final\n"
+            f"print('loaded:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    result = run_python(["-c", code])
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "loaded:"
+
+
+def test_parse_help_does_not_load_heavy_modules():
+    code = ("import sys, ah_analyzer_final\n"
+            "try:\n"
+            "    ah_analyzer_final.main(['parse', '--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            f"print('loaded:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    result = run_python(["-c", code])
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "loaded:"
+
+
+@pytest.mark.parametrize("args", [["--help"], ["parse", "--help"]])
+def test_startup_within_budget(args):
+    elapsed = best_startup_time([SCRIPT] + args)
+    assert elapsed < STARTUP_BUDGET_SECONDS, f"{' '.join(args)} took {elapsed:.3f}s"
+
+
+def test_main_help_exits_cleanly(capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        ah_analyzer_final.main(["--help"])
+    assert excinfo.value.code == 0
+    assert "parse" in capsys.readouterr().out